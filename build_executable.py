@@ -13,6 +13,17 @@ import platform
 import shutil
 from pathlib import Path
 
+# 运行时不需要的大型模块，排除以减小可执行文件体积并加快启动
+EXCLUDED_MODULES = (
+    "tkinter", "matplotlib", "scipy", "pandas", "PyQt5", "PySide2", "wx",
+    "IPython", "pytest", "distutils", "setuptools._vendor",
+)
+
+# PIL 按需加载的格式插件，显式声明避免被依赖分析遗漏
+HIDDEN_IMPORTS = (
+    "PIL.JpegImagePlugin", "PIL.WebPImagePlugin", "PIL.PngImagePlugin",
+)
+
 class ExecutableBuilder:
     """可执行文件构建器"""
     
@@ -21,6 +32,12 @@ class ExecutableBuilder:
         self.dist_dir = self.project_root / "dist"
         self.build_dir = self.project_root / "build"
         self.main_script = self.project_root / "tinypng_cli.py"
+        # 每个平台/架构/Python 版本独立的 PyInstaller 缓存，支持并行构建
+        self.cache_dir = (
+            self.project_root / ".pyinstaller_cache"
+            / f"{platform.system()}_{platform.machine()}_{platform.python_version()}"
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
     def check_dependencies(self):
         """检查构建依赖"""
@@ -71,7 +88,6 @@ class ExecutableBuilder:
             "--name=tinypng",
             "--distpath", str(self.dist_dir),
             "--workpath", str(self.build_dir),
-            "--clean",
             "--noconfirm"
         ]
         
@@ -82,10 +98,14 @@ class ExecutableBuilder:
         
         # 优化选项
         if optimize:
-            cmd.extend([
-                "--strip",  # 去除调试符号
-                "--optimize=2"  # Python 优化级别
-            ])
+            cmd.append("--optimize=2")  # Python 优化级别
+            # macOS 上 strip 会破坏代码签名，且 universal2 需逐个架构处理
+            if platform.system().lower() != "darwin":
+                cmd.append("--strip")  # 去除调试符号
+        
+        # 裁剪模块
+        cmd.extend(f"--exclude-module={module}" for module in EXCLUDED_MODULES)
+        cmd.extend(f"--hidden-import={module}" for module in HIDDEN_IMPORTS)
         
         # 调试选项
         if debug:
@@ -117,26 +137,28 @@ class ExecutableBuilder:
         
         print(f"🚀 执行命令: {' '.join(cmd)}")
         
-        try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print("✅ 构建成功！")
-            
-            # 显示输出信息
-            if result.stdout:
-                print("📋 构建输出:")
-                print(result.stdout)
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ 构建失败 (退出码: {e.returncode})")
-            if e.stdout:
-                print("📋 标准输出:")
-                print(e.stdout)
-            if e.stderr:
-                print("❌ 错误输出:")
-                print(e.stderr)
+        env = {**os.environ, "PYINSTALLER_CONFIG_DIR": str(self.cache_dir)}
+        
+        # 实时转发构建输出，避免管道缓冲区写满导致 PyInstaller 阻塞
+        print("📋 构建输出:")
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=env
+        )
+        for line in proc.stdout:
+            sys.stdout.write(line)
+        returncode = proc.wait()
+        
+        if returncode != 0:
+            print(f"❌ 构建失败 (退出码: {returncode})")
             return False
+        
+        print("✅ 构建成功！")
+        return True
     
     def verify_executable(self):
         """验证可执行文件"""
@@ -196,7 +218,7 @@ class ExecutableBuilder:
         
         print("=" * 50)
     
-    def build(self, mode="onefile", optimize=True, debug=False, clean=True):
+    def build(self, mode="onefile", optimize=True, debug=False, clean=False):
         """完整构建流程"""
         try:
             # 检查依赖
@@ -235,7 +257,7 @@ def main():
   python3 build_executable.py --mode onedir      # 目录模式构建
   python3 build_executable.py --no-optimize      # 禁用优化
   python3 build_executable.py --debug            # 调试模式
-  python3 build_executable.py --no-clean         # 不清理构建目录
+  python3 build_executable.py --clean            # 清理构建目录后完整重建
         """
     )
     
@@ -249,7 +271,7 @@ def main():
     parser.add_argument(
         "--no-optimize", 
         action="store_true",
-        help="禁用优化 (减小文件大小但可能影响性能)"
+        help="禁用优化 (默认启用 --optimize=2，macOS 以外的平台同时使用 --strip)"
     )
     
     parser.add_argument(
@@ -259,9 +281,9 @@ def main():
     )
     
     parser.add_argument(
-        "--no-clean", 
+        "--clean", 
         action="store_true",
-        help="不清理构建目录 (增量构建)"
+        help="清理构建目录后完整重建 (默认增量构建)"
     )
     
     args = parser.parse_args()
@@ -274,7 +296,7 @@ def main():
         mode=args.mode,
         optimize=not args.no_optimize,
         debug=args.debug,
-        clean=not args.no_clean
+        clean=args.clean
     )
     
     if success:
@@ -12,12 +12,14 @@ import click
 from pathlib import Path
 from PIL import Image, ImageOps
 import tempfile
+import shutil
 from tqdm import tqdm
 from colorama import init, Fore, Style
 import json
-import piexif
 import time
 import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # 初始化 colorama (仅在支持的环境中)
 try:
@@ -66,11 +68,40 @@ class LoadingSpinner:
             time.sleep(0.1)
             i += 1
 
+# JPEG 编码器可直接写入的元数据字段
+_JPEG_PASSTHROUGH = ('exif', 'icc_profile', 'dpi', 'xmp', 'comment')
+
+# PNG 编码器可直接写入的元数据字段，其余仅保留文本块
+_PNG_PASSTHROUGH = ('exif', 'icc_profile', 'dpi')
+
+# 批量模式支持的图片扩展名，元组可直接用于 str.endswith
+_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff')
+
+# fast 预设下视为已充分压缩的每像素字节数阈值
+_FAST_COPY_BPP = {'.jpg': 0.5, '.jpeg': 0.5, '.png': 1.5}
+
+class _NullSpinner:
+    """不显示任何内容的 loading 占位"""
+    
+    def start(self):
+        pass
+    
+    def stop(self, success=True):
+        pass
+
 class ImageCompressor:
     """图片压缩器类"""
     
-    def __init__(self, quality=85, optimize=True, progressive=True, preset='balanced'):
+    def __init__(self, quality=85, optimize=True, progressive=True, preset='balanced', batch_mode=False, downscale=False):
+        # 保存原始参数，便于在工作进程中重建压缩器
+        self._init_args = (quality, optimize, progressive, preset, downscale)
         self.preset = preset
+        # 是否允许以半分辨率解码超大 JPEG (会改变输出尺寸，需用户显式开启)
+        self.downscale = downscale
+        # 批量模式下不显示逐文件输出，由父进程汇总
+        self.batch_mode = batch_mode
+        # 仅在交互式终端的单文件模式下显示 loading，批量模式已有 tqdm 进度条
+        self.interactive = sys.stdout.isatty() and not batch_mode
         # 根据预设调整参数
         if preset == 'fast':
             self.quality = max(70, quality - 10)
@@ -88,37 +119,18 @@ class ImageCompressor:
             self.quality = quality
             self.optimize = optimize
             self.progressive = progressive
+        # 最近一次压缩的实际输出路径
+        self.output_path = None
+        # 最近一次压缩的错误信息，由调用方统一输出
+        self.error = None
+        # PNG zlib 压缩级别，fast 预设牺牲少量体积换取编码速度
+        self.png_compress_level = {'fast': 6}.get(preset, 9)
+        # WebP 编码方法 (0-6)，越大越慢，仅 quality 预设使用最高档
+        self.webp_method = {'fast': 3, 'balanced': 4, 'quality': 6}.get(preset, 4)
         
-    def _extract_metadata(self, img):
-        """提取图片的元数据"""
-        metadata = {}
-        try:
-            # 提取所有可用的元数据
-            for key, value in img.info.items():
-                metadata[key] = value
-                    
-        except Exception as e:
-            print(f"{Fore.YELLOW}警告: 提取元数据失败: {e}{Style.RESET_ALL}")
-            
-        return metadata
-    
-    def _preserve_metadata(self, original_path, output_path):
-        """使用 piexif 库保留 EXIF 数据"""
-        try:
-            # 尝试从原图提取 EXIF 数据
-            with Image.open(original_path) as original_img:
-                if 'exif' in original_img.info:
-                    exif_data = original_img.info['exif']
-                    
-                    # 使用 piexif 库将 EXIF 数据写入压缩后的图片
-                    try:
-                        piexif.insert(exif_data, str(output_path))
-                        print(f"{Fore.GREEN}✓ 成功保留 EXIF 数据{Style.RESET_ALL}")
-                    except Exception as e:
-                        print(f"{Fore.YELLOW}警告: EXIF 数据写入失败: {e}{Style.RESET_ALL}")
-                        
-        except Exception as e:
-            print(f"{Fore.YELLOW}警告: 元数据处理失败: {e}{Style.RESET_ALL}")
+    def _extract_metadata(self, img, keys):
+        """提取图片的元数据，仅保留编码器可直接写入的字段"""
+        return {key: img.info[key] for key in keys if key in img.info}
     
     def _save_png_with_metadata(self, img, output_path, metadata):
         """保存 PNG 并保留元数据"""
@@ -128,8 +140,13 @@ class ImageCompressor:
             # 创建 PNG 信息对象
             meta = PngImagePlugin.PngInfo()
             
-            # 添加元数据
+            # 编码器原生支持的元数据直接作为保存参数
+            save_kwargs = {key: value for key, value in metadata.items() if key in _PNG_PASSTHROUGH}
+            
+            # 其余元数据作为文本块写入
             for key, value in metadata.items():
+                if key in _PNG_PASSTHROUGH:
+                    continue
                 if isinstance(value, bytes):
                     # 对于二进制数据，尝试解码为文本
                     try:
@@ -142,12 +159,12 @@ class ImageCompressor:
                     meta.add_text(key, str(value))
             
             # 使用 PNG 优化保存并手动注入元数据
-            img.save(output_path, 'PNG', pnginfo=meta, optimize=self.optimize, compress_level=0)
+            img.save(output_path, 'PNG', pnginfo=meta, optimize=self.optimize, compress_level=self.png_compress_level, **save_kwargs)
             
             return True
             
         except Exception as e:
-            print(f"{Fore.RED}PNG 元数据保存失败: {e}{Style.RESET_ALL}")
+            self.error = f"PNG 元数据保存失败: {e}"
             return False
         
     def compress_jpeg(self, input_path, output_path):
@@ -157,20 +174,25 @@ class ImageCompressor:
             self.start_time = time.time()
             
             # 显示压缩进度
-            spinner = LoadingSpinner("压缩 JPEG 图片")
+            spinner = LoadingSpinner("压缩 JPEG 图片") if self.interactive else _NullSpinner()
             spinner.start()
             
             with Image.open(input_path) as img:
                 # 提取并保存原始元数据
-                metadata = self._extract_metadata(img)
+                metadata = self._extract_metadata(img, _JPEG_PASSTHROUGH)
+                
+                # 开启 --downscale 时，超大 JPEG 利用 libjpeg 的 DCT 缩放以半分辨率解码
+                if self.downscale and img.format == 'JPEG' and max(img.size) > 2000:
+                    img.draft('RGB', (img.size[0] // 2, img.size[1] // 2))
                 
                 # 转换为 RGB 模式（JPEG 不支持透明通道）
                 if img.mode in ('RGBA', 'LA', 'P'):
                     # 创建白色背景
                     background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
+                    if img.mode != 'RGBA':
                         img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+                    # getchannel 只取出 alpha 通道，无需拆分全部通道
+                    background.paste(img, mask=img.getchannel('A'))
                     img = background
                 elif img.mode != 'RGB':
                     img = img.convert('RGB')
@@ -185,18 +207,15 @@ class ImageCompressor:
                 # 将提取的元数据添加到保存参数中
                 save_kwargs.update(metadata)
                 
-                # 保存时应用压缩设置并保留元数据
+                # 保存时应用压缩设置并保留元数据 (EXIF 由编码器直接写入)
                 img.save(output_path, 'JPEG', **save_kwargs)
                 
-                # 使用 piexif 库确保 EXIF 数据被正确保留
-                self._preserve_metadata(input_path, output_path)
-                
                 # 先停止 loading
                 spinner.stop(True)
                 
                 return True
         except Exception as e:
-            print(f"{Fore.RED}压缩 JPEG 失败: {e}{Style.RESET_ALL}")
+            self.error = f"压缩 JPEG 失败: {e}"
             return False
     
     def compress_png(self, input_path, output_path):
@@ -206,12 +225,13 @@ class ImageCompressor:
             self.start_time = time.time()
             
             # 显示压缩进度
-            spinner = LoadingSpinner("压缩 PNG 图片")
+            spinner = LoadingSpinner("压缩 PNG 图片") if self.interactive else _NullSpinner()
             spinner.start()
             
             with Image.open(input_path) as img:
-                # 提取并保存原始元数据
-                metadata = self._extract_metadata(img)
+                # 提取并保存原始元数据，文本块单独读取，避免把 tRNS 等块当作文本写入
+                metadata = self._extract_metadata(img, _PNG_PASSTHROUGH)
+                metadata.update(getattr(img, 'text', {}))
                 
                 # 保持原始模式（支持透明通道）
                 if img.mode == 'P':
@@ -228,7 +248,7 @@ class ImageCompressor:
                 
                 return success
         except Exception as e:
-            print(f"{Fore.RED}压缩 PNG 失败: {e}{Style.RESET_ALL}")
+            self.error = f"压缩 PNG 失败: {e}"
             return False
     
     def compress_webp(self, input_path, output_path):
@@ -238,7 +258,7 @@ class ImageCompressor:
             self.start_time = time.time()
             
             # 显示压缩进度
-            spinner = LoadingSpinner("压缩 WebP 图片")
+            spinner = LoadingSpinner("压缩 WebP 图片") if self.interactive else _NullSpinner()
             spinner.start()
             
             with Image.open(input_path) as img:
@@ -248,7 +268,7 @@ class ImageCompressor:
                 # 准备保存参数，保留所有元数据
                 save_kwargs = {
                     'quality': self.quality,
-                    'method': 6,  # 最高压缩方法
+                    'method': self.webp_method,
                     'lossless': False
                 }
                 
@@ -267,24 +287,21 @@ class ImageCompressor:
                     img = img.convert('RGB')
                     img.save(output_path, 'WEBP', **save_kwargs)
                 
-                # 使用 piexif 库确保 EXIF 数据被正确保留
-                self._preserve_metadata(input_path, output_path)
-                
                 # 先停止 loading
                 spinner.stop(True)
                 
                 return True
         except Exception as e:
-            print(f"{Fore.RED}压缩 WebP 失败: {e}{Style.RESET_ALL}")
+            self.error = f"压缩 WebP 失败: {e}"
             return False
     
     def compress_image(self, input_path, output_path=None, format=None, overwrite=False):
-        """智能压缩图片"""
+        """智能压缩图片，返回 (是否成功, 原始大小, 压缩后大小, 总用时, 错误信息)，跳过时是否成功为 None"""
         input_path = Path(input_path)
+        self.error = None
         
         if not input_path.exists():
-            print(f"{Fore.RED}输入文件不存在: {input_path}{Style.RESET_ALL}")
-            return False
+            return (False, 0, 0, 0, f"输入文件不存在: {input_path}")
         
         # 确定输出路径
         if output_path is None:
@@ -292,13 +309,14 @@ class ImageCompressor:
         else:
             output_path = Path(output_path)
         
-        # 如果输出文件已存在且不覆盖，则提示用户
+        # 如果输出文件已存在且不覆盖，批量模式直接跳过，否则提示用户
         if output_path.exists() and not overwrite:
+            if self.batch_mode:
+                return (None, 0, 0, 0, "输出文件已存在")
             print(f"{Fore.YELLOW}输出文件已存在: {output_path}{Style.RESET_ALL}")
             print(f"是否覆盖? (y/N): ", end="", flush=True)
             if input("").lower() != 'y':
-                print(f"{Fore.YELLOW}已取消压缩{Style.RESET_ALL}")
-                return False
+                return (None, 0, 0, 0, "已取消压缩")
         
         # 确定输出格式
         if format is None:
@@ -313,50 +331,84 @@ class ImageCompressor:
         
         # 根据格式选择压缩方法
         success = False
-        if format in ['.jpg', '.jpeg']:
+        if self.preset == 'fast' and format == input_path.suffix.lower() and self._is_already_compressed(input_path, format):
+            # 已充分压缩的图片直接复制，跳过解码和重新编码
+            self.start_time = time.time()
+            try:
+                # 原地压缩时输出即输入，无需复制
+                if not (output_path.exists() and os.path.samefile(input_path, output_path)):
+                    shutil.copyfile(input_path, output_path)
+                success = True
+            except OSError as e:
+                self.error = f"复制图片失败: {e}"
+                success = False
+        elif format in ['.jpg', '.jpeg']:
             success = self.compress_jpeg(input_path, output_path)
         elif format == '.png':
             success = self.compress_png(input_path, output_path)
         elif format == '.webp':
             success = self.compress_webp(input_path, output_path)
         else:
-            print(f"{Fore.YELLOW}不支持的格式: {format}，尝试自动检测...{Style.RESET_ALL}")
+            # 批量模式下由父进程统一输出，不在工作进程中打印
+            if not self.batch_mode:
+                print(f"{Fore.YELLOW}不支持的格式: {format}，尝试自动检测...{Style.RESET_ALL}")
             # 尝试自动检测格式
             try:
                 with Image.open(input_path) as img:
                     if img.format == 'JPEG':
-                        success = self.compress_jpeg(input_path, output_path.with_suffix('.jpg'))
+                        output_path = output_path.with_suffix('.jpg')
+                        success = self.compress_jpeg(input_path, output_path)
                     elif img.format == 'PNG':
-                        success = self.compress_png(input_path, output_path.with_suffix('.png'))
+                        output_path = output_path.with_suffix('.png')
+                        success = self.compress_png(input_path, output_path)
                     elif img.format == 'WEBP':
-                        success = self.compress_webp(input_path, output_path.with_suffix('.webp'))
+                        output_path = output_path.with_suffix('.webp')
+                        success = self.compress_webp(input_path, output_path)
                     else:
-                        print(f"{Fore.RED}无法识别的图片格式: {img.format}{Style.RESET_ALL}")
-                        return False
+                        return (False, 0, 0, 0, f"无法识别的图片格式: {img.format}")
             except Exception as e:
-                print(f"{Fore.RED}无法读取图片: {e}{Style.RESET_ALL}")
-                return False
+                return (False, 0, 0, 0, f"无法读取图片: {e}")
         
-        if success:
-            # 计算压缩率
-            original_size = input_path.stat().st_size
-            compressed_size = output_path.stat().st_size
-            compression_ratio = (1 - compressed_size / original_size) * 100
-
-                # 计算并显示总用时
-            end_time = time.time()
-            total_time = end_time - self.start_time if hasattr(self, 'start_time') else 0
-            
-            print(f"{Fore.GREEN}✓ 压缩成功, 总用时: {total_time:.2f}S{Style.RESET_ALL}")
-            print(f"  原始大小: {self.format_size(original_size)}")
-            print(f"  压缩后: {self.format_size(compressed_size)}")
-            print(f"  压缩率: {compression_ratio:.1f}%")
-            print(f"  输出文件: {output_path}")
-                        
-            return True
-        else:
-            print(f"{Fore.RED}✗ 压缩失败{Style.RESET_ALL}")
+        # 记录实际输出路径到实例变量
+        self.output_path = output_path
+        
+        if not success:
+            return (False, 0, 0, 0, self.error)
+        
+        # 计算大小和总用时，由调用方负责输出
+        original_size = input_path.stat().st_size
+        compressed_size = output_path.stat().st_size
+        total_time = time.time() - self.start_time if hasattr(self, 'start_time') else 0
+        
+        return (True, original_size, compressed_size, total_time, None)
+    
+    def _format_result(self, path, result):
+        """将单张图片的压缩结果格式化为一行摘要"""
+        success, original_size, compressed_size, total_time, message = result
+        detail = f" ({message})" if message else ""
+        if success is None:
+            return f"{Fore.YELLOW}- 已跳过: {path}{detail}{Style.RESET_ALL}"
+        if not success:
+            return f"{Fore.RED}✗ 压缩失败: {path}{detail}{Style.RESET_ALL}"
+        compression_ratio = (1 - compressed_size / original_size) * 100 if original_size else 0
+        return (
+            f"{Fore.GREEN}✓ {path}{Style.RESET_ALL} "
+            f"{self.format_size(original_size)} → {self.format_size(compressed_size)} "
+            f"(压缩率 {compression_ratio:.1f}%, 用时 {total_time:.2f}S)"
+        )
+    
+    def _is_already_compressed(self, input_path, format):
+        """根据每像素字节数判断图片是否已充分压缩"""
+        threshold = _FAST_COPY_BPP.get(format)
+        if threshold is None:
+            return False
+        try:
+            # 仅读取文件头获取尺寸，不解码像素数据
+            with Image.open(input_path) as img:
+                width, height = img.size
+        except Exception:
             return False
+        return input_path.stat().st_size / (width * height) < threshold
     
     def format_size(self, size_bytes):
         """格式化文件大小显示"""
@@ -369,7 +421,7 @@ class ImageCompressor:
             i += 1
         return f"{size_bytes:.1f}{size_names[i]}"
     
-    def batch_compress(self, input_dir, output_dir=None, recursive=False, format=None, overwrite=False):
+    def batch_compress(self, input_dir, output_dir=None, recursive=False, format=None, overwrite=False, jobs=0):
         """批量压缩图片"""
         input_dir = Path(input_dir)
         
@@ -386,17 +438,8 @@ class ImageCompressor:
         # 创建输出目录
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # 支持的图片格式
-        supported_formats = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff'}
-        
         # 收集所有图片文件
-        image_files = []
-        if recursive:
-            image_files = list(input_dir.rglob('*'))
-        else:
-            image_files = list(input_dir.glob('*'))
-        
-        image_files = [f for f in image_files if f.is_file() and f.suffix.lower() in supported_formats]
+        image_files = list(_iter_images(input_dir, recursive, _IMAGE_EXTS))
         
         if not image_files:
             print(f"{Fore.YELLOW}在目录 {input_dir} 中未找到支持的图片文件{Style.RESET_ALL}")
@@ -404,17 +447,9 @@ class ImageCompressor:
         
         print(f"{Fore.CYAN}找到 {len(image_files)} 个图片文件{Style.RESET_ALL}")
         
-        # 批量压缩
-        success_count = 0
-        total_original_size = 0
-        total_compressed_size = 0
-        
-        print(f"{Fore.CYAN}开始批量压缩 {len(image_files)} 张图片...{Style.RESET_ALL}")
-        
-        for i, image_file in enumerate(tqdm(image_files, desc="压缩进度", unit="张", ncols=80)):
-            # 显示当前处理的文件
-            print(f"\n{Fore.BLUE}[{i+1}/{len(image_files)}] 处理: {image_file.name}{Style.RESET_ALL}")
-            
+        # 准备压缩任务
+        tasks = []
+        for image_file in image_files:
             # 计算相对路径以保持目录结构
             if recursive:
                 rel_path = image_file.relative_to(input_dir)
@@ -426,20 +461,76 @@ class ImageCompressor:
             # 确保输出文件的父目录存在
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # 压缩图片
-            if self.compress_image(image_file, output_file, format, overwrite):
-                success_count += 1
-                total_original_size += image_file.stat().st_size
-                total_compressed_size += output_file.stat().st_size
+            tasks.append((image_file, output_file, format, overwrite))
+        
+        # 批量压缩
+        success_count = 0
+        skip_count = 0
+        total_original_size = 0
+        total_compressed_size = 0
+        
+        print(f"{Fore.CYAN}开始批量压缩 {len(tasks)} 张图片...{Style.RESET_ALL}")
+        
+        # 每个文件都是独立的编码任务，分发到多个进程并行处理
+        # jobs 为 0 时传 None，由执行器按平台限制选择进程数 (Windows 上限 61)
+        with ProcessPoolExecutor(max_workers=jobs or None, initializer=_init_worker, initargs=self._init_args) as executor:
+            results = executor.map(_compress_one, tasks, chunksize=4)
+            with tqdm(total=len(tasks), desc="压缩进度", unit="张", ncols=80) as pbar:
+                for task, result in zip(tasks, results):
+                    # 每个文件只输出一行结果，由父进程统一打印
+                    tqdm.write(self._format_result(task[1], result))
+                    success, original_size, compressed_size, _, _ = result
+                    if success is None:
+                        skip_count += 1
+                    elif success:
+                        success_count += 1
+                        total_original_size += original_size
+                        total_compressed_size += compressed_size
+                    pbar.set_postfix(saved=self.format_size(total_original_size - total_compressed_size))
+                    pbar.update()
         
         # 显示批量压缩结果
         print(f"\n{Fore.CYAN}批量压缩完成！{Style.RESET_ALL}")
-        print(f"成功压缩: {success_count}/{len(image_files)} 张图片")
+        print(f"成功压缩: {success_count}/{len(image_files) - skip_count} 张图片")
+        if skip_count > 0:
+            print(f"已跳过: {skip_count} 张图片 (输出文件已存在)")
         if success_count > 0:
             total_compression_ratio = (1 - total_compressed_size / total_original_size) * 100
             print(f"总压缩率: {total_compression_ratio:.1f}%")
             print(f"节省空间: {self.format_size(total_original_size - total_compressed_size)}")
 
+def _iter_images(root, recursive, exts):
+    """使用 os.scandir 遍历目录，仅返回扩展名匹配的图片文件 (exts 为小写扩展名元组)"""
+    try:
+        it = os.scandir(root)
+    except OSError:
+        # 无法读取的目录直接跳过，与 pathlib 的遍历行为一致
+        return
+    with it:
+        for entry in it:
+            # 文件允许是符号链接，目录则不跟随链接，避免循环遍历
+            if entry.is_file():
+                if entry.name.lower().endswith(exts):
+                    yield Path(entry.path)
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                yield from _iter_images(entry.path, recursive, exts)
+
+# 工作进程内复用的压缩器实例，由 _init_worker 创建
+_WORKER = None
+
+def _init_worker(quality, optimize, progressive, preset, downscale):
+    """工作进程初始化，每个进程只创建一次压缩器"""
+    global _WORKER
+    _WORKER = ImageCompressor(quality, optimize, progressive, preset, batch_mode=True, downscale=downscale)
+
+def _compress_one(args):
+    """在工作进程中压缩单张图片，返回 compress_image 的结果元组，异常计为失败"""
+    try:
+        return _WORKER.compress_image(*args)
+    except Exception as e:
+        # 单个文件出错不能中断整个进程池，交由父进程计入失败
+        return (False, 0, 0, 0, str(e))
+
 @click.command()
 @click.argument('input_path', type=click.Path(exists=True))
 @click.option('-o', '--output', 'output_path', type=click.Path(), help='输出文件路径 (仅单文件模式)')
@@ -450,9 +541,11 @@ class ImageCompressor:
 @click.option('--no-optimize', is_flag=True, help='禁用优化')
 @click.option('--no-progressive', is_flag=True, help='禁用渐进式 JPEG')
 @click.option('--preset', type=click.Choice(['fast', 'balanced', 'quality']), default='balanced', help='压缩预设 (fast, balanced, quality)')
-@click.option('--overwrite', is_flag=True, help='覆盖已存在的输出文件')
+@click.option('--downscale', is_flag=True, help='将长边超过 2000px 的 JPEG 以半分辨率输出 (会改变图片尺寸，换取更快的速度)')
+@click.option('-j', '--jobs', default=0, type=click.IntRange(0), help='并行进程数 (0=自动，批量模式)')
+@click.option('--overwrite', is_flag=True, help='覆盖已存在的输出文件 (批量模式下未指定时跳过已存在的文件)')
 @click.version_option(version='1.0.0', prog_name='tinypng-cli')
-def main(input_path, output_path, format, quality, output_dir, recursive, no_optimize, no_progressive, preset, overwrite):
+def main(input_path, output_path, format, quality, output_dir, recursive, no_optimize, no_progressive, preset, downscale, jobs, overwrite):
     """
     TinyPNG CLI - 智能图片压缩工具
     
@@ -467,6 +560,8 @@ def main(input_path, output_path, format, quality, output_dir, recursive, no_opt
         tinypng-cli images/ -d compressed/       # 批量压缩目录
         tinypng-cli images/ -r -d compressed/    # 递归批量压缩
         tinypng-cli images/ -f png               # 批量转换为PNG格式
+        tinypng-cli images/ -j 4                 # 限制为 4 个并行进程
+        tinypng-cli images/ --downscale          # 超大 JPEG 以半分辨率输出
     """
     # 参数验证和模式判断
     input_path = Path(input_path)
@@ -489,9 +584,10 @@ def main(input_path, output_path, format, quality, output_dir, recursive, no_opt
             quality=quality,
             optimize=not no_optimize,
             progressive=not no_progressive,
-            preset=preset
+            preset=preset,
+            downscale=downscale
         )
-        compressor.batch_compress(input_path, output_dir, recursive, format, overwrite)
+        compressor.batch_compress(input_path, output_dir, recursive, format, overwrite, jobs)
         
     else:
         # 单文件模式参数验证
@@ -508,11 +604,16 @@ def main(input_path, output_path, format, quality, output_dir, recursive, no_opt
             quality=quality,
             optimize=not no_optimize,
             progressive=not no_progressive,
-            preset=preset
+            preset=preset,
+            downscale=downscale
         )
-        success = compressor.compress_image(input_path, output_path, format, overwrite)
-        if not success:
+        result = compressor.compress_image(input_path, output_path, format, overwrite)
+        print(compressor._format_result(compressor.output_path or input_path, result))
+        # 用户取消 (None) 不视为失败
+        if result[0] is False:
             sys.exit(1)
 
 if __name__ == '__main__':
+    # PyInstaller 打包后使用多进程需要此调用
+    multiprocessing.freeze_support()
     main()
@@ -8,10 +8,51 @@ TinyPNG CLI 版本管理脚本
 import os
 import sys
 import re
-import subprocess
-import argparse
 from pathlib import Path
-from datetime import datetime
+
+# TOML 解析器 (Python 3.11+ 自带 tomllib，旧版本可选安装 tomli)
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# 版本号匹配模式，模块加载时编译一次 (版本号均为 ASCII，直接匹配原始字节，无需解码全文)
+# 第 1 个分组为版本号本身；pyproject 模式锚定行首，避免匹配 python_version 等键
+_PYPROJECT_VERSION_CAP_RE = re.compile(rb'^version\s*=\s*["\']([^"\']+)["\']', re.MULTILINE)
+_CLICK_VERSION_CAP_RE = re.compile(rb'@click\.version_option\(version=[\'"]([^\'"]+)[\'"]')
+
+# 需要同步版本号的文件: (相对项目根目录的路径, 匹配模式)
+_VERSION_FILES = [
+    ("pyproject.toml", _PYPROJECT_VERSION_CAP_RE),
+    ("tinypng_cli.py", _CLICK_VERSION_CAP_RE),
+]
+
+# 各版本类型的递增规则
+_BUMP = {
+    'major': lambda major, minor, patch: (major + 1, 0, 0),
+    'minor': lambda major, minor, patch: (major, minor + 1, 0),
+    'patch': lambda major, minor, patch: (major, minor, patch + 1),
+}
+
+def _update_file(path, pattern, new_version, content=None):
+    """替换文件中第一个匹配的版本号，返回 (新内容字节, 是否有变化)，文件不存在时返回 None"""
+    if content is None:
+        if not path.exists():
+            return None
+        # 按字节读写，编码和换行符保持原样
+        content = path.read_bytes()
+    # 一次搜索定位版本号，直接拼接替换，无需再次扫描全文
+    match = pattern.search(content)
+    if match is None:
+        return content, False
+    new_content = content[:match.start(1)] + new_version.encode('ascii') + content[match.end(1):]
+    if new_content == content:
+        return content, False
+    path.write_bytes(new_content)
+    return new_content, True
 
 class VersionManager:
     """版本管理器"""
@@ -20,74 +61,124 @@ class VersionManager:
         self.project_root = Path(__file__).parent
         self.pyproject_file = self.project_root / "pyproject.toml"
         self.main_script = self.project_root / "tinypng_cli.py"
+        # 当前版本缓存，update_version 写入后同步更新
+        self._version_cache = None
+        # pyproject.toml 的 (原始字节, 版本号) 缓存
+        self._pyproject = None
+        # pyproject.toml 是版本号的主要来源，只检查一次是否存在
+        self._has_pyproject = self.pyproject_file.is_file()
+        # 工作目录是否干净的缓存 (None 表示未知)，写文件或提交后同步更新
+        self._git_clean = None
         
+    def _is_git_clean(self):
+        """检查已跟踪文件相对 HEAD 是否有更改，结果缓存；无法获取时返回 None"""
+        if self._git_clean is None:
+            import subprocess
+            
+            # diff-index 依赖索引中缓存的 stat 信息，先刷新以免仅时间戳变化被误判为修改
+            subprocess.run(["git", "update-index", "-q", "--refresh"],
+                           cwd=self.project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # diff-index 只比较已跟踪文件与 HEAD，不扫描未跟踪文件
+            # 退出码 0 表示干净，1 表示有更改，其他表示出错
+            result = subprocess.run(["git", "diff-index", "--quiet", "HEAD", "--"],
+                                    cwd=self.project_root, stderr=subprocess.DEVNULL)
+            if result.returncode in (0, 1):
+                self._git_clean = result.returncode == 0
+        return self._git_clean
+    
     def get_current_version(self):
         """获取当前版本"""
-        if self.pyproject_file.exists():
-            content = self.pyproject_file.read_text()
-            match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
-            if match:
-                return match.group(1)
-        
-        # 从主脚本获取版本
-        if self.main_script.exists():
-            content = self.main_script.read_text()
-            match = re.search(r'@click\.version_option\(version=[\'"]([^\'"]+)[\'"]', content)
-            if match:
-                return match.group(1)
-        
-        return "1.0.0"
+        if self._version_cache is None:
+            self._version_cache = self._read_version()
+        return self._version_cache
+    
+    def _load_pyproject(self):
+        """读取 pyproject.toml，返回 (原始字节, 版本号)，文件只读取一次"""
+        if self._pyproject is None:
+            text = None
+            version = None
+            if self._has_pyproject:
+                text = self.pyproject_file.read_bytes()
+                if tomllib is not None:
+                    data = tomllib.loads(text.decode('utf-8'))
+                    version = (
+                        data.get('project', {}).get('version')
+                        or data.get('tool', {}).get('poetry', {}).get('version')
+                    )
+                else:
+                    # 无 TOML 解析器时退回正则匹配
+                    match = _PYPROJECT_VERSION_CAP_RE.search(text)
+                    if match:
+                        version = match.group(1).decode('ascii')
+            self._pyproject = (text, version)
+        return self._pyproject
+    
+    def _read_pyproject_version(self):
+        """从 pyproject.toml 获取版本"""
+        _, version = self._load_pyproject()
+        return version
+    
+    def _read_main_script_version(self):
+        """从主脚本的 click 版本装饰器获取版本"""
+        if not self.main_script.exists():
+            return None
+        match = _CLICK_VERSION_CAP_RE.search(self.main_script.read_bytes())
+        return match.group(1).decode('ascii') if match else None
+    
+    def _read_version(self):
+        """从项目文件读取版本号，pyproject.toml 命中时不再访问主脚本"""
+        return (
+            self._read_pyproject_version()
+            or self._read_main_script_version()
+            or "1.0.0"
+        )
     
     def update_version(self, new_version, version_type=None):
         """更新版本号"""
-        print(f"🔄 更新版本号到 {new_version}...")
+        from concurrent.futures import ThreadPoolExecutor
         
-        # 更新 pyproject.toml
-        if self.pyproject_file.exists():
-            content = self.pyproject_file.read_text()
-            content = re.sub(
-                r'version\s*=\s*["\'][^"\']+["\']',
-                f'version = "{new_version}"',
-                content
-            )
-            self.pyproject_file.write_text(content)
-            print(f"✅ 更新 {self.pyproject_file}")
-        
-        # 更新主脚本
-        if self.main_script.exists():
-            content = self.main_script.read_text()
-            content = re.sub(
-                r'@click\.version_option\(version=[\'"][^\'"]+[\'"]',
-                f'@click.version_option(version=\'{new_version}\'',
-                content
-            )
-            self.main_script.write_text(content)
-            print(f"✅ 更新 {self.main_script}")
+        print(f"🔄 更新版本号到 {new_version}...")
         
-        # 更新 requirements.txt 中的版本引用
-        requirements_file = self.project_root / "requirements.txt"
-        if requirements_file.exists():
-            content = requirements_file.read_text()
-            # 这里可以添加版本更新逻辑
-            print(f"✅ 更新 {requirements_file}")
+        # 并行更新登记的所有文件，pyproject.toml 复用已读取的内容
+        pyproject_content, _ = self._load_pyproject()
+        with ThreadPoolExecutor(max_workers=len(_VERSION_FILES)) as executor:
+            futures = {}
+            for name, pattern in _VERSION_FILES:
+                path = self.project_root / name
+                content = pyproject_content if path == self.pyproject_file else None
+                future = executor.submit(_update_file, path, pattern, new_version, content)
+                futures[future] = path
+            
+            # 按提交顺序收集结果，保证输出顺序与 _VERSION_FILES 一致
+            for future, path in futures.items():
+                result = future.result()
+                if result is None:
+                    continue
+                new_content, changed = result
+                if changed:
+                    self._git_clean = False
+                    print(f"✅ 更新 {path}")
+                else:
+                    print(f"⏭️  {path} 无变化，跳过写入")
+                if path == self.pyproject_file:
+                    self._pyproject = (new_content, new_version)
         
+        self._version_cache = new_version
         print(f"🎉 版本已更新到 {new_version}")
     
     def bump_version(self, bump_type):
         """自动递增版本号"""
         current = self.get_current_version()
-        major, minor, patch = map(int, current.split('.'))
+        major_s, _, rest = current.partition('.')
+        minor_s, _, patch_s = rest.partition('.')
+        try:
+            major, minor, patch = int(major_s), int(minor_s), int(patch_s)
+        except ValueError:
+            raise ValueError(f"无效的版本号: {current} (应为 major.minor.patch)")
         
-        if bump_type == 'major':
-            major += 1
-            minor = 0
-            patch = 0
-        elif bump_type == 'minor':
-            minor += 1
-            patch = 0
-        elif bump_type == 'patch':
-            patch += 1
-        else:
+        try:
+            major, minor, patch = _BUMP[bump_type](major, minor, patch)
+        except KeyError:
             raise ValueError(f"无效的版本类型: {bump_type}")
         
         new_version = f"{major}.{minor}.{patch}"
@@ -96,19 +187,36 @@ class VersionManager:
     
     def create_git_tag(self, version, message=None):
         """创建 Git 标签"""
+        import subprocess
+        
         if not message:
             message = f"Release version {version}"
         
+        commit_message = f"Bump version to {version}"
+        tag = f"v{version}"
+        
+        # 本脚本在调用 git/make 前不持有需要保护的文件描述符，
+        # 因此使用 close_fds=False 跳过子进程中的描述符清理
         try:
-            # 添加所有更改
-            subprocess.run(["git", "add", "."], check=True)
-            
-            # 提交更改
-            subprocess.run(["git", "commit", "-m", f"Bump version to {version}"], check=True)
-            
-            # 创建标签
-            subprocess.run(["git", "tag", "-a", f"v{version}", "-m", message], check=True)
+            if self._is_git_clean():
+                # 没有需要提交的更改，直接为当前 HEAD 打标签
+                subprocess.run(["git", "tag", "-a", tag, "-m", message], cwd=self.project_root, check=True, close_fds=False)
+            elif os.name == "posix":
+                # 在同一个 shell 进程中依次执行添加、提交和打标签
+                # 参数通过位置参数传入，避免引号转义问题
+                script = 'git add . && git commit -m "$1" && git tag -a "$2" -m "$3"'
+                subprocess.run(["sh", "-c", script, "sh", commit_message, tag, message], cwd=self.project_root, check=True, close_fds=False)
+            else:
+                # 添加所有更改
+                subprocess.run(["git", "add", "."], cwd=self.project_root, check=True, close_fds=False)
+                
+                # 提交更改
+                subprocess.run(["git", "commit", "-m", commit_message], cwd=self.project_root, check=True, close_fds=False)
+                
+                # 创建标签
+                subprocess.run(["git", "tag", "-a", tag, "-m", message], cwd=self.project_root, check=True, close_fds=False)
             
+            self._git_clean = True
             print(f"✅ Git 标签 v{version} 创建成功")
             return True
             
@@ -118,17 +226,31 @@ class VersionManager:
     
     def build_release(self, version):
         """构建发布版本"""
+        import subprocess
+        
         print(f"🔨 构建发布版本 {version}...")
         
+        # make 直接继承终端的 stdout/stderr，不经过管道缓冲；
+        # stdin 指向 DEVNULL，避免子进程等待终端输入而阻塞
+        # (close_fds=False 的原因见 create_git_tag)
+        run_kwargs = {
+            "cwd": self.project_root,
+            "stdin": subprocess.DEVNULL,
+            "check": True,
+            "close_fds": False,
+        }
+        # 先刷新缓冲区，保证输出顺序
+        sys.stdout.flush()
+        
         try:
             # 清理构建目录
-            subprocess.run(["make", "clean"], check=True)
+            subprocess.run(["make", "clean"], **run_kwargs)
             
             # 构建可执行文件
-            subprocess.run(["make", "build-executable"], check=True)
+            subprocess.run(["make", "build-executable"], **run_kwargs)
             
             # 构建 Python 包
-            subprocess.run(["make", "build"], check=True)
+            subprocess.run(["make", "build"], **run_kwargs)
             
             print(f"✅ 发布版本 {version} 构建成功")
             return True
@@ -139,39 +261,45 @@ class VersionManager:
     
     def show_status(self):
         """显示当前状态"""
-        print("📊 项目状态")
-        print("=" * 50)
+        import subprocess
+        
+        # 先收集所有输出，最后一次性写入
+        lines = ["📊 项目状态", "=" * 50]
         
         current_version = self.get_current_version()
-        print(f"当前版本: {current_version}")
+        lines.append(f"当前版本: {current_version}")
         
         # Git 状态
-        try:
-            result = subprocess.run(["git", "status", "--porcelain"], 
-                                  capture_output=True, text=True, check=True)
-            if result.stdout.strip():
-                print("📝 有未提交的更改:")
-                print(result.stdout)
-            else:
-                print("✅ 工作目录干净")
-        except subprocess.CalledProcessError:
-            print("⚠️  无法获取 Git 状态")
+        git_clean = self._is_git_clean()
+        if git_clean:
+            lines.append("✅ 工作目录干净")
+        elif git_clean is False:
+            # 仅在有更改时获取文件列表 (只读取 stdout，stderr 直接丢弃)
+            with subprocess.Popen(["git", "diff-index", "--name-status", "HEAD", "--"],
+                                  cwd=self.project_root, stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, bufsize=4096, text=True) as proc:
+                output = proc.stdout.read()
+            lines.append("📝 有未提交的更改:")
+            lines.append(output.rstrip("\n"))
+        else:
+            lines.append("⚠️  无法获取 Git 状态")
         
         # 构建状态
         dist_dir = self.project_root / "dist"
         if dist_dir.exists():
-            files = list(dist_dir.glob("*"))
-            if files:
-                print(f"📦 构建文件 ({len(files)} 个):")
-                for file in files:
-                    size = file.stat().st_size / (1024 * 1024)
-                    print(f"  {file.name} ({size:.1f} MB)")
+            with os.scandir(dist_dir) as it:
+                entries = [(entry.name, entry.stat().st_size) for entry in it]
+            if entries:
+                lines.append(f"📦 构建文件 ({len(entries)} 个):")
+                for name, size in entries:
+                    lines.append(f"  {name} ({size / (1024 * 1024):.1f} MB)")
             else:
-                print("📦 构建目录为空")
+                lines.append("📦 构建目录为空")
         else:
-            print("📦 构建目录不存在")
+            lines.append("📦 构建目录不存在")
         
-        print("=" * 50)
+        lines.append("=" * 50)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def release(self, version_type, message=None, skip_build=False):
         """完整的发布流程"""
@@ -203,6 +331,17 @@ class VersionManager:
 
 def main():
     """主函数"""
+    # 最常用的 status 命令无需构建完整的参数解析器
+    if sys.argv[1:] == ['status']:
+        try:
+            VersionManager().show_status()
+        except Exception as e:
+            print(f"❌ 操作失败: {e}")
+            sys.exit(1)
+        return
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="TinyPNG CLI 版本管理脚本",
         formatter_class=argparse.RawDescriptionHelpFormatter,